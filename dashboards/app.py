@@ -1,20 +1,45 @@
+import sys
+from pathlib import Path
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go 
-import numpy as np
 import yaml
 
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src import store
+from src.data_cache import IncrementalQueryCache, open_ended_filters
+from src.cross_city import compare_cities
+
 # -----------------------
 # Load Data
 # -----------------------
+# Filters are pushed down into the SQLite store, so only matching rows are loaded.
+# Cached results are keyed on the store version: when the pipeline writes new
+# data, only the changed rows are fetched and merged in the background.
+@st.cache_resource
+def get_cache():
+    return IncrementalQueryCache()
+
+@st.cache_data
+def load_meta(version):
+    return store.meta()
+
+def load_data(cities=None, start=None, end=None):
+    df = get_cache().get(cities, start, end)
+    return df.rename(columns={"datetime": "date"})  # standardize to 'date'
+
 @st.cache_data
-def load_data():
-    df = pd.read_csv("data/processed/merged_data.csv", parse_dates=["datetime"])
-    df.rename(columns={"datetime": "date"}, inplace=True)  # standardize to 'date'
+def load_latest(version):
+    df = store.latest()
+    df.rename(columns={"datetime": "date"}, inplace=True)
     return df
 
-df = load_data()
+data_version = store.version()
+meta = load_meta(data_version)
 
 # Load city info from the single source of truth
 with open("config/config.yaml", "r") as f:
@@ -28,20 +53,16 @@ city_info = config["cities"]
 st.sidebar.title("🔍Filters")
 cities = st.sidebar.multiselect(
     "🌆 Select Cities",
-    df["city"].unique(),
-    default=df["city"].unique()
+    meta["cities"],
+    default=meta["cities"]
 )
 
 start_date, end_date = st.sidebar.date_input(
     "📅 select Date Range",
-    [df["date"].min(), df["date"].max()]
+    [meta["start"], meta["end"]]
 )
 
-filtered_df = df[
-    (df["city"].isin(cities)) &
-    (df["date"] >= pd.to_datetime(start_date)) &
-    (df["date"] <= pd.to_datetime(end_date))
-]
+filtered_df = load_data(*open_ended_filters(meta, tuple(cities), start_date, end_date)).copy()
 
 
 
@@ -51,16 +72,8 @@ filtered_df = df[
 st.title(" Energy & Weather Dashboard")
 st.header("1. Geographic Overview")
 
-# Prepare latest data per city
-latest_df = df.sort_values("date").groupby("city").tail(1).copy()
-
-# Get % change in usage from yesterday
-def get_prev_usage(city, date):
-    prev = df[(df["city"] == city) & (df["date"] == date - pd.Timedelta(days=1))]
-    return prev["energy_consumption_mw"].values[0] if not prev.empty else np.nan
-
-latest_df["prev_energy"] = latest_df.apply(lambda row: get_prev_usage(row["city"], row["date"]), axis=1)
-latest_df["energy_change_pct"] = ((latest_df["energy_consumption_mw"] - latest_df["prev_energy"]) / latest_df["prev_energy"]) * 100
+# Prepare latest data per city, with % change in usage from yesterday
+latest_df = load_latest(data_version).copy()
 
 # Add lat/lon
 latest_df["lat"] = latest_df["city"].map(lambda x: city_info[x]["lat"])
@@ -145,6 +158,8 @@ st.plotly_chart(fig_map, use_container_width=True)
 
 update_time = latest_df["date"].max().strftime("%B %d, %Y")
 st.caption(f"🕒 Last updated: {update_time}")
+if get_cache().is_refreshing():
+    st.caption("🔄 New data found, refreshing in the background...")
 
 
 
@@ -153,12 +168,11 @@ st.caption(f"🕒 Last updated: {update_time}")
 # 2️⃣ Time Series Analysis
 st.header("2. Time Series Analysis")
 
-# Convert date column if not already
-df["date"] = pd.to_datetime(df["date"])
-
-# Filter to last 90 days
-last_90 = df["date"].max() - pd.Timedelta(days=90)
-recent_df = df[df["date"] >= last_90]
+# Filter to last 90 days. The query starts at the first of that month so the
+# cache key only changes once a month; the remaining days are trimmed here.
+last_90 = meta["end"] - pd.Timedelta(days=90)
+recent_df = load_data(start=last_90.to_period("M").to_timestamp())
+recent_df = recent_df[recent_df["date"] >= last_90]
 
 # City selector
 city_option = st.selectbox("Select city", ["All Cities"] + sorted(recent_df["city"].unique()))
@@ -232,6 +246,10 @@ st.plotly_chart(fig_ts, use_container_width=True)
 # -----------------------
 st.header("3. Correlation Analysis")
 
+if filtered_df.empty:
+    st.info("No data for the selected cities and dates.")
+    st.stop()
+
 corr_df = filtered_df.dropna(subset=["avg_temp_f", "energy_consumption_mw"])
 
 # Scatter plot with regression line
@@ -324,3 +342,44 @@ fig_heatmap.update_layout(
 
 # 7. Show plot
 st.plotly_chart(fig_heatmap, use_container_width=True)
+
+
+
+# -----------------------
+# 5️⃣ Cross-City Comparison
+# -----------------------
+st.header("5. Cross-City Comparison")
+
+ranking, city_corr = compare_cities(filtered_df.rename(columns={"date": "datetime"}))
+
+st.dataframe(
+    ranking.sort_values("mean_energy_mw_rank"),
+    hide_index=True,
+    column_config={
+        "city": "City",
+        "days": "Days",
+        "mean_energy_mw": st.column_config.NumberColumn("Avg Energy (MW)", format="%.0f"),
+        "mw_per_degree_day": st.column_config.NumberColumn("MW per Degree-Day", format="%.1f"),
+        "peak_to_average": st.column_config.NumberColumn("Peak / Avg", format="%.2f"),
+        "weekday_weekend_delta_mw": st.column_config.NumberColumn("Weekday − Weekend (MW)", format="%.0f"),
+        "weekday_weekend_delta_pct": st.column_config.NumberColumn("Weekday − Weekend (%)", format="%.1f"),
+        "temp_energy_corr": st.column_config.NumberColumn("Temp ↔ Energy r", format="%.2f"),
+    },
+    use_container_width=True
+)
+
+fig_city_corr = px.imshow(
+    city_corr,
+    text_auto=".2f",
+    color_continuous_scale="RdBu_r",
+    zmin=-1,
+    zmax=1,
+    aspect="auto",
+    title="Daily Demand Correlation Between Cities"
+)
+fig_city_corr.update_layout(
+    xaxis_title="City",
+    yaxis_title="City",
+    margin=dict(t=50, b=40),
+)
+st.plotly_chart(fig_city_corr, use_container_width=True)
@@ -1,7 +1,15 @@
+import sys
 import pandas as pd
 import logging
 from pathlib import Path
 
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src import store
+from src.cross_city import pivot_matrix, columnwise_corr
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -11,12 +19,12 @@ output_file = Path("data/processed/analysis_report.csv")
 
 def analyze_merged_data():
     try:
-        if not merged_file.exists():
+        if not merged_file.exists() and not store.DB_FILE.exists():
             logging.error(f"❌ Merged file not found: {merged_file}")
             return
 
-        logging.info(f"📊 Loading merged data from: {merged_file}")
-        df = pd.read_csv(merged_file, parse_dates=["datetime"])
+        logging.info(f"📊 Loading merged data from: {store.DB_FILE}")
+        df = store.query(columns=["datetime", "city", "avg_temp_f", "energy_consumption_mw"])
 
         # Drop rows with missing critical data
         df = df.dropna(subset=["avg_temp_f", "energy_consumption_mw"])
@@ -26,9 +34,12 @@ def analyze_merged_data():
         stats.columns = ['_'.join(col) for col in stats.columns]
 
         # Compute correlation between temperature and energy
-        correlations = df.groupby("city").apply(
-            lambda g: g["avg_temp_f"].corr(g["energy_consumption_mw"])
-        ).reset_index(name="temp_energy_corr")
+        temp = pivot_matrix(df, "avg_temp_f", freq=None)
+        energy = pivot_matrix(df, "energy_consumption_mw", freq=None).reindex_like(temp)
+        correlations = pd.DataFrame({
+            "city": temp.columns,
+            "temp_energy_corr": columnwise_corr(temp, energy)
+        })
 
         # Combine results
         report_df = stats.reset_index().merge(correlations, on="city")
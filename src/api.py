@@ -0,0 +1,168 @@
+import sys
+import numpy as np
+import pandas as pd
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Query
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src import store
+
+# Same bins and ordering as the dashboard heatmap
+TEMP_BINS = [-float("inf"), 50, 60, 70, 80, 90, float("inf")]
+TEMP_LABELS = ["<50°F", "50-60°F", "60-70°F", "70-80°F", "80-90°F", ">90°F"]
+WEEKDAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+DATA_COLUMNS = ["datetime", "city", "tmax_f", "tmin_f", "avg_temp_f", "energy_consumption_mw"]
+PAGE_SIZE = 1000        # default rows per /data page
+MAX_PAGE_SIZE = 10000
+
+app = FastAPI(title="Energy & Weather API")
+
+_cached_version = None
+
+
+def data_version():
+    """Version of the processed store; changes whenever the pipeline writes to it.
+
+    Memoised results for older versions can never be hit again, so they are
+    dropped as soon as a new version is seen.
+    """
+    global _cached_version
+    try:
+        version = store.version()
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if version != _cached_version:
+        clear_caches()
+        _cached_version = version
+    return version
+
+
+def _to_records(df):
+    df = df.copy()
+    for col in df.select_dtypes("datetime").columns:
+        df[col] = df[col].dt.strftime("%Y-%m-%dT%H:%M:%S")
+    return df.replace({np.nan: None}).to_dict(orient="records")
+
+
+def query_slice(cities=None, start=None, end=None, limit=PAGE_SIZE, offset=0):
+    """One page of raw rows. Not memoised: pages are cheap range scans, and
+    caching them would hold raw data in memory instead of small summaries."""
+    return _to_records(store.query(cities, start, end, columns=DATA_COLUMNS, limit=limit, offset=offset))
+
+
+# -----------------------
+# Aggregations (cached per data version + arguments)
+# -----------------------
+@lru_cache(maxsize=256)
+def query_meta(version):
+    info = store.meta()
+    return {**info, "start": info["start"].isoformat(), "end": info["end"].isoformat()}
+
+
+@lru_cache(maxsize=256)
+def query_latest(version):
+    """Latest row per city plus % change in usage versus the previous day."""
+    return _to_records(store.latest())
+
+
+@lru_cache(maxsize=256)
+def query_heatmap(version, city, start=None, end=None):
+    """Mean energy by temperature bin (rows) and weekday (columns) for one city."""
+    df = store.query([city], start, end, columns=["datetime", "avg_temp_f", "energy_consumption_mw"])
+    temp_bin = pd.cut(df["avg_temp_f"], bins=TEMP_BINS, labels=TEMP_LABELS)
+    pivot = (
+        df["energy_consumption_mw"]
+        .groupby([temp_bin, df["datetime"].dt.day_name()], observed=True)
+        .mean()
+        .unstack()
+        .reindex(index=TEMP_LABELS, columns=WEEKDAY_ORDER)
+    )
+    return {
+        "city": city,
+        "index": TEMP_LABELS,
+        "columns": WEEKDAY_ORDER,
+        "values": pivot.replace({np.nan: None}).values.tolist(),
+    }
+
+
+def _fit(x, y):
+    if len(x) < 2 or np.ptp(x) == 0:
+        return {"n": int(len(x)), "slope": None, "intercept": None, "r_squared": None, "r": None}
+    slope, intercept = np.polyfit(x, y, 1)
+    r = float(np.corrcoef(x, y)[0, 1])
+    return {"n": int(len(x)), "slope": float(slope), "intercept": float(intercept), "r_squared": r ** 2, "r": r}
+
+
+@lru_cache(maxsize=256)
+def query_regression(version, cities=None, start=None, end=None):
+    """OLS of energy on temperature, overall and per city."""
+    df = store.query(cities, start, end, columns=["city", "avg_temp_f", "energy_consumption_mw"]).dropna(subset=["avg_temp_f", "energy_consumption_mw"])
+    result = {"all": _fit(df["avg_temp_f"].to_numpy(), df["energy_consumption_mw"].to_numpy())}
+    for city, g in df.groupby("city"):
+        result[city] = _fit(g["avg_temp_f"].to_numpy(), g["energy_consumption_mw"].to_numpy())
+    return result
+
+
+def clear_caches():
+    global _cached_version
+    for query in (query_meta, query_latest, query_heatmap, query_regression):
+        query.cache_clear()
+    _cached_version = None
+
+
+# -----------------------
+# Routes
+# -----------------------
+def _cities_key(version, cities):
+    """Sorted tuple of requested cities (None for all); 404 if any is not in the store."""
+    if not cities:
+        return None
+    cities = tuple(sorted(set(cities)))
+    unknown = [c for c in cities if c not in query_meta(version)["cities"]]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown cities: {', '.join(unknown)}")
+    return cities
+
+
+@app.get("/meta")
+def meta():
+    return query_meta(data_version())
+
+
+@app.get("/data")
+def data(city: Optional[List[str]] = Query(None), start: Optional[date] = None, end: Optional[date] = None,
+         limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), offset: int = Query(0, ge=0)):
+    """Rows ordered by city and datetime, one page at a time; a short page is the last one."""
+    version = data_version()
+    return query_slice(_cities_key(version, city), start, end, limit, offset)
+
+
+@app.get("/latest")
+def latest():
+    return query_latest(data_version())
+
+
+@app.get("/heatmap/{city}")
+def heatmap(city: str, start: Optional[date] = None, end: Optional[date] = None):
+    version = data_version()
+    _cities_key(version, [city])
+    return query_heatmap(version, city, start, end)
+
+
+@app.get("/regression")
+def regression(city: Optional[List[str]] = Query(None), start: Optional[date] = None, end: Optional[date] = None):
+    version = data_version()
+    return query_regression(version, _cities_key(version, city), start, end)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="127.0.0.1", port=8000)
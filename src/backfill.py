@@ -0,0 +1,189 @@
+import sys
+import json
+import argparse
+import threading
+import yaml
+import pandas as pd
+from datetime import date, timedelta
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src import store
+from src.data_fetcher import get_noaa_weather, get_eia_energy
+from src.data_processor import load_and_merge_city_data, clean_data
+from src.station_resolver import resolve_cities, unresolved_cities
+from src.schema import read_table
+
+RAW_DIR = Path("data/raw")
+BACKFILL_DIR = RAW_DIR / "backfill"
+MANIFEST_FILE = BACKFILL_DIR / "manifest.json"
+
+SHARD_DAYS = 30      # keeps NOAA (1000 results) and EIA (5000 rows) requests to a single page
+MAX_WORKERS = 4
+KINDS = ("weather", "energy")
+
+_manifest_lock = threading.Lock()
+
+
+def plan_shards(cities, start_date, end_date, shard_days=SHARD_DAYS):
+    """Split (city x kind x date range) into fixed-size shards."""
+    shards = []
+    for city in cities:
+        shard_start = start_date
+        while shard_start <= end_date:
+            shard_end = min(shard_start + timedelta(days=shard_days - 1), end_date)
+            for kind in KINDS:
+                shards.append({
+                    "id": f"{city}/{kind}/{shard_start.isoformat()}_{shard_end.isoformat()}",
+                    "city": city,
+                    "kind": kind,
+                    "start": shard_start,
+                    "end": shard_end,
+                })
+            shard_start = shard_end + timedelta(days=1)
+    return shards
+
+
+def load_manifest(path=MANIFEST_FILE):
+    if not path.exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest, path=MANIFEST_FILE):
+    # Write then rename so a crash mid-write never corrupts the manifest
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    tmp_path.replace(path)
+
+
+def _shard_file(shard, backfill_dir=BACKFILL_DIR):
+    return backfill_dir / f"{shard['id']}.csv"
+
+
+def run_shard(shard, city_info, backfill_dir=BACKFILL_DIR):
+    """Fetch one shard and write it to its own file; returns the row count."""
+    if shard["kind"] == "weather":
+        df = get_noaa_weather(shard["city"], city_info["station_id"], shard["start"], shard["end"])
+    else:
+        df = get_eia_energy(city_info["eia_region"], shard["start"], shard["end"])
+
+    output_file = _shard_file(shard, backfill_dir)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(output_file, index=False)
+    return len(df)
+
+
+def run_backfill(cities_config, start_date, end_date, workers=MAX_WORKERS,
+                 backfill_dir=BACKFILL_DIR, manifest_file=MANIFEST_FILE, fetch_shard=run_shard):
+    """Run every shard not already recorded as done in the manifest.
+
+    Each completed shard is checkpointed immediately, so rerunning the same
+    command after a crash only fetches what is missing.
+    """
+    manifest = load_manifest(manifest_file)
+    shards = plan_shards(cities_config.keys(), start_date, end_date)
+    pending = [s for s in shards if manifest.get(s["id"], {}).get("status") != "done"]
+    print(f"📦 {len(shards)} shards planned, {len(shards) - len(pending)} already done, {len(pending)} to run")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(fetch_shard, shard, cities_config[shard["city"]], backfill_dir): shard
+            for shard in pending
+        }
+        for future in as_completed(futures):
+            shard = futures[future]
+            try:
+                rows = future.result()
+                entry = {"status": "done", "rows": rows, "file": str(_shard_file(shard, backfill_dir))}
+                print(f"✅ {shard['id']} ({rows} rows)")
+            except Exception as e:
+                failed.append(shard["id"])
+                entry = {"status": "failed", "error": str(e)}
+                print(f"❌ {shard['id']}: {e}")
+            with _manifest_lock:
+                manifest[shard["id"]] = entry
+                _save_manifest(manifest, manifest_file)
+
+    return failed
+
+
+def compact(cities, raw_dir=RAW_DIR, backfill_dir=BACKFILL_DIR):
+    """Merge shard files into the per-city raw files, newest values winning."""
+    for city in cities:
+        for kind in KINDS:
+            shard_files = sorted((backfill_dir / city / kind).glob("*.csv"))
+            if not shard_files:
+                continue
+            raw_file = raw_dir / f"{city}_{kind}.csv"
+            frames = [read_table(raw_file, kind)] if raw_file.exists() else []
+            frames += [read_table(f, kind) for f in shard_files]
+            frames = [f for f in frames if not f.empty]
+            if not frames:
+                continue
+
+            df = pd.concat(frames, ignore_index=True)
+            df = df.drop_duplicates(subset=["datetime"], keep="last")
+            # Weather files are stored oldest first, energy files newest first
+            df = df.sort_values("datetime", ascending=(kind == "weather"))
+            df.to_csv(raw_file, index=False)
+            print(f"🗜️ Compacted {len(shard_files)} shards into {raw_file} ({len(df)} rows)")
+
+
+def load_into_store(cities, raw_dir=RAW_DIR, db_file=None):
+    """Merge and clean the compacted raw files and upsert them into the store.
+
+    The daily pipeline only refetches a short window and rewrites the raw
+    files, so the backfilled history has to reach the store here.
+    """
+    frames = []
+    for city in cities:
+        merged = load_and_merge_city_data(city, raw_dir)
+        if merged is not None:
+            frames.append(clean_data(merged))
+    if not frames:
+        print("❌ No backfilled data to load into the store.")
+        return 0
+
+    count = store.upsert(pd.concat(frames, ignore_index=True), db_file)
+    print(f"✅ Upserted {count} backfilled rows into {db_file or store.DB_FILE}")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable historical backfill of raw weather and energy data.")
+    parser.add_argument("--start", required=True, type=date.fromisoformat, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(), help="Last day (YYYY-MM-DD)")
+    parser.add_argument("--cities", nargs="*", help="Subset of configured cities (default: all)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--no-compact", action="store_true", help="Leave shard files in place (and out of the store)")
+    args = parser.parse_args()
+
+    with open("config/config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+    cities = resolve_cities(config["cities"])
+    if args.cities:
+        cities = {city: cities[city] for city in args.cities}
+    for city in unresolved_cities(cities):
+        print(f"⚠️ Skipping {city}: no station_id / eia_region within range of its lat/lon.")
+        del cities[city]
+
+    failed = run_backfill(cities, args.start, args.end, workers=args.workers)
+    if failed:
+        print(f"⚠️ {len(failed)} shards failed; rerun the same command to retry them.")
+        return
+    if not args.no_compact:
+        compact(cities.keys())
+        load_into_store(cities.keys())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import sys
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src import store
+
+RANKING_FILE = Path("data/processed/cross_city_ranking.csv")
+CORRELATION_FILE = Path("data/processed/cross_city_correlation.csv")
+
+DEGREE_DAY_BASE_F = 65.0
+MIN_OVERLAP = 7       # days two cities must share for a correlation
+
+
+def pivot_matrix(df, value, freq="D"):
+    """Pivot long data into a time x city matrix, resampled to ``freq`` means (None keeps raw timestamps)."""
+    matrix = df.pivot_table(index="datetime", columns="city", values=value, aggfunc="mean")
+    if freq is not None:
+        matrix = matrix.resample(freq).mean()
+    return matrix.sort_index(axis=1)
+
+
+def columnwise_corr(a, b):
+    """Pearson correlation between matching columns of two aligned matrices."""
+    a, b = a.to_numpy(dtype=float), b.to_numpy(dtype=float)
+    both = ~(np.isnan(a) | np.isnan(b))
+    n = both.sum(axis=0)
+    a, b = np.where(both, a, 0.0), np.where(both, b, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_a, mean_b = a.sum(axis=0) / n, b.sum(axis=0) / n
+        da, db = np.where(both, a - mean_a, 0.0), np.where(both, b - mean_b, 0.0)
+        return (da * db).sum(axis=0) / np.sqrt((da ** 2).sum(axis=0) * (db ** 2).sum(axis=0))
+
+
+def compare_cities(df):
+    """Ranking table and city x city demand correlation from long merged data.
+
+    Every metric is computed on the whole time x city matrix at once, so the
+    cost grows with the matrix size, not with the number of cities looped over.
+    """
+    energy = pivot_matrix(df, "energy_consumption_mw")
+    temp = pivot_matrix(df, "avg_temp_f").reindex_like(energy)
+
+    # Both sides of the demand/degree-day ratio cover only days that have both values
+    degree_days = (temp - DEGREE_DAY_BASE_F).abs().where(energy.notna())
+    paired_energy = energy.where(degree_days.notna())
+    weekend = energy.index.dayofweek >= 5
+
+    weekday_mean = energy[~weekend].mean()
+    weekend_mean = energy[weekend].mean()
+    mean_energy = energy.mean()
+
+    ranking = pd.DataFrame({
+        "days": energy.count(),
+        "mean_energy_mw": mean_energy,
+        "mw_per_degree_day": paired_energy.sum() / degree_days.sum().replace(0, np.nan),
+        "peak_to_average": energy.max() / mean_energy,
+        "weekday_weekend_delta_mw": weekday_mean - weekend_mean,
+        "weekday_weekend_delta_pct": (weekday_mean - weekend_mean) / weekend_mean * 100,
+        "temp_energy_corr": columnwise_corr(temp, energy),
+    })
+    ranking.index.name = "city"
+
+    for metric in ["mean_energy_mw", "mw_per_degree_day", "peak_to_average", "weekday_weekend_delta_pct"]:
+        ranking[f"{metric}_rank"] = ranking[metric].rank(ascending=False, method="min").astype("Int64")
+
+    correlation = energy.corr(min_periods=MIN_OVERLAP)
+    return ranking.reset_index(), correlation
+
+
+def generate_cross_city_report():
+    logging.info(f"📊 Building cross-city comparison from: {store.DB_FILE}")
+    df = store.query(columns=["datetime", "city", "avg_temp_f", "energy_consumption_mw"])
+    if df.empty:
+        logging.error("❌ No data available for cross-city comparison.")
+        return None
+
+    ranking, correlation = compare_cities(df)
+    ranking.to_csv(RANKING_FILE, index=False)
+    correlation.to_csv(CORRELATION_FILE)
+    logging.info(f"✅ Saved cross-city ranking to {RANKING_FILE} and correlations to {CORRELATION_FILE}")
+    return ranking
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    print(generate_cross_city_report())
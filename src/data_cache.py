@@ -0,0 +1,95 @@
+import threading
+import pandas as pd
+from collections import OrderedDict
+
+from src import store
+
+MAX_ENTRIES = 32
+KEY_COLUMNS = ["city", "datetime"]
+
+
+def open_ended_filters(meta, cities=None, start=None, end=None):
+    """Drop filters that only restate the store's own extent.
+
+    Selecting every city, or a date bound equal to the store's first/last
+    date, becomes None. Those bounds move whenever the pipeline adds data, so
+    keeping them would give the default views a new cache key on every run
+    instead of an incremental refresh of the existing entry.
+    """
+    if cities is not None and sorted(cities) == sorted(meta["cities"]):
+        cities = None
+    if start is not None and meta["start"] is not None and pd.Timestamp(start) <= meta["start"].normalize():
+        start = None
+    if end is not None and meta["end"] is not None and pd.Timestamp(end) >= meta["end"].normalize():
+        end = None
+    return cities, start, end
+
+
+class _Entry:
+    def __init__(self, frame, version):
+        self.frame = frame
+        self.version = version
+        self.refreshing = False
+
+
+class IncrementalQueryCache:
+    """Keeps store query results in memory and tops them up as the store changes.
+
+    On each ``get`` the store version is checked (a single indexed lookup).
+    If it moved, only the rows changed since the cached version are fetched
+    in a background thread and merged into the cached frame; callers keep
+    getting the previous frame until the merge is done.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, db_file=None, background=True):
+        self.max_entries = max_entries
+        self.db_file = db_file
+        self.background = background
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cities=None, start=None, end=None):
+        key = (tuple(sorted(cities)) if cities is not None else None, start, end)
+        current = store.version(self.db_file)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                stale = entry.version < current and not entry.refreshing
+                if stale:
+                    entry.refreshing = True
+
+        if entry is None:
+            # Cold start for this filter: load it once, synchronously
+            frame = store.query(key[0], start, end, db_file=self.db_file)
+            entry = _Entry(frame, current)
+            with self._lock:
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        elif stale:
+            if self.background:
+                threading.Thread(target=self._refresh, args=(key, entry, current), daemon=True).start()
+            else:
+                self._refresh(key, entry, current)
+
+        return entry.frame
+
+    def is_refreshing(self):
+        with self._lock:
+            return any(entry.refreshing for entry in self._entries.values())
+
+    def _refresh(self, key, entry, target_version):
+        cities, start, end = key
+        try:
+            changed = store.query(cities, start, end, since_version=entry.version, db_file=self.db_file)
+            frame = entry.frame
+            if not changed.empty:
+                keys = pd.MultiIndex.from_frame(changed[KEY_COLUMNS])
+                kept = frame[~pd.MultiIndex.from_frame(frame[KEY_COLUMNS]).isin(keys)]
+                frame = pd.concat([kept, changed], ignore_index=True).sort_values(KEY_COLUMNS, ignore_index=True)
+            # Swap in the merged frame in one step so readers never see a partial merge
+            entry.frame, entry.version = frame, target_version
+        finally:
+            entry.refreshing = False
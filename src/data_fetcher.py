@@ -21,12 +21,13 @@ eia_token = os.getenv("EIA_API_KEY")
 output_dir = Path("data/raw")
 output_dir.mkdir(parents=True, exist_ok=True)
 
-def fetch_noaa_weather(city, station_id, days_back=90):
-    print(f"\n🌤️ Fetching NOAA weather for {city} | station: {station_id}")
-    base_url = "https://www.ncei.noaa.gov/cdo-web/api/v2/data"
-    end_date = datetime.now().date()
-    start_date = end_date - timedelta(days=days_back)
+# Column layout of the raw files
+WEATHER_COLUMNS = ["datetime", "city", "tmax_f", "tmin_f", "avg_temp_f"]
+ENERGY_COLUMNS = ["datetime", "respondent", "respondent-name", "type", "type-name", "energy_consumption_mw", "value-units"]
 
+def get_noaa_weather(city, station_id, start_date, end_date):
+    """Fetch daily TMAX/TMIN for a date range as a DataFrame (raises on HTTP errors)."""
+    base_url = "https://www.ncei.noaa.gov/cdo-web/api/v2/data"
     params = {
         "datasetid": "GHCND",                        
         "stationid": station_id,                 
@@ -39,47 +40,56 @@ def fetch_noaa_weather(city, station_id, days_back=90):
 
     headers = {"token": noaa_token}
 
-    try:
-        response = requests.get(base_url, headers=headers, params=params)
-        response.raise_for_status()
+    response = requests.get(base_url, headers=headers, params=params)
+    response.raise_for_status()
+
+    data = response.json().get("results", [])    
+    print(f"📦 NOAA Response Sample: {data[:2]}")
+
+    # Process data into one row per date
+    daily_data = {}
+    for item in data:
+        date = item["date"][:10]
+        if date not in daily_data:
+            daily_data[date] = {"tmax": None, "tmin": None}
+        if item["datatype"] == "TMAX":
+            daily_data[date]["tmax"] = item["value"]
+        elif item["datatype"] == "TMIN":
+            daily_data[date]["tmin"] = item["value"]
+
+    records = []
+    for date, temps in daily_data.items():
+        tmax_c = temps["tmax"] / 10.0 if temps["tmax"] is not None else None
+        tmin_c = temps["tmin"] / 10.0 if temps["tmin"] is not None else None
+        tmax_f = round(tmax_c * 9 / 5 + 32, 2) if tmax_c is not None else None
+        tmin_f = round(tmin_c * 9 / 5 + 32, 2) if tmin_c is not None else None
+        avg_temp_f = round((tmax_f + tmin_f) / 2, 2) if tmax_f and tmin_f else None
+
+        records.append({
+            "datetime": date,
+            "city": city,
+            "tmax_f": tmax_f,
+            "tmin_f": tmin_f,
+            "avg_temp_f": avg_temp_f
+        })
+
+    df = pd.DataFrame(records, columns=WEATHER_COLUMNS)
+    df["datetime"] = pd.to_datetime(df["datetime"])
+    df.sort_values("datetime", inplace=True)
+    return df
 
-        data = response.json().get("results", [])    
-        print(f"📦 NOAA Response Sample: {data[:2]}")
 
-        if not data:
-            print(f"⚠️ No weather data returned for {city} — check station, date, or datatype.")
-            return
+def fetch_noaa_weather(city, station_id, days_back=90):
+    print(f"\n🌤️ Fetching NOAA weather for {city} | station: {station_id}")
+    end_date = datetime.now().date()
+    start_date = end_date - timedelta(days=days_back)
 
-        # Process data into one row per date
-        daily_data = {}
-        for item in data:
-            date = item["date"][:10]
-            if date not in daily_data:
-                daily_data[date] = {"tmax": None, "tmin": None}
-            if item["datatype"] == "TMAX":
-                daily_data[date]["tmax"] = item["value"]
-            elif item["datatype"] == "TMIN":
-                daily_data[date]["tmin"] = item["value"]
-
-        records = []
-        for date, temps in daily_data.items():
-            tmax_c = temps["tmax"] / 10.0 if temps["tmax"] is not None else None
-            tmin_c = temps["tmin"] / 10.0 if temps["tmin"] is not None else None
-            tmax_f = round(tmax_c * 9 / 5 + 32, 2) if tmax_c is not None else None
-            tmin_f = round(tmin_c * 9 / 5 + 32, 2) if tmin_c is not None else None
-            avg_temp_f = round((tmax_f + tmin_f) / 2, 2) if tmax_f and tmin_f else None
-
-            records.append({
-                "datetime": date,
-                "city": city,
-                "tmax_f": tmax_f,
-                "tmin_f": tmin_f,
-                "avg_temp_f": avg_temp_f
-            })
+    try:
+        df = get_noaa_weather(city, station_id, start_date, end_date)
 
-        df = pd.DataFrame(records)
-        df["datetime"] = pd.to_datetime(df["datetime"])
-        df.sort_values("datetime", inplace=True)
+        if df.empty:
+            print(f"⚠️ No weather data returned for {city} — check station, date, or datatype.")
+            return
 
         output_file = output_dir / f"{city}_weather.csv"
         df.to_csv(output_file, index=False)
@@ -92,6 +102,13 @@ def fetch_noaa_weather(city, station_id, days_back=90):
 
 
 
+def _to_energy_frame(records):
+    df = pd.DataFrame(records)
+    df = df.rename(columns={"period": "datetime", "value": "energy_consumption_mw"})
+    df["datetime"] = pd.to_datetime(df["datetime"])
+    return df
+
+
 def fetch_eia_energy(city, region, days_back=90):
     print(f"\n⚡ Fetching EIA energy for {city} | region: {region}")
     series_id = f"EBA.{region}-ALL.D.H"
@@ -113,8 +130,7 @@ def fetch_eia_energy(city, region, days_back=90):
             print(f"❌ Missing expected fields in EIA data for {city}")
             return
 
-        df = df.rename(columns={"period": "datetime", "value": "energy_consumption_mw"})
-        df["datetime"] = pd.to_datetime(df["datetime"])
+        df = _to_energy_frame(records)
         cutoff = datetime.now() - timedelta(days=days_back)
         df = df[df["datetime"] >= cutoff]
 
@@ -124,6 +140,33 @@ def fetch_eia_energy(city, region, days_back=90):
         print(f"❌ Failed to fetch EIA data for {city}: {e}")
 
 
+def get_eia_energy(region, start_date, end_date):
+    """Fetch hourly demand for a date range as a DataFrame (raises on HTTP errors).
+
+    Uses the RTO region-data route, which (unlike the series id route) accepts
+    explicit start/end bounds.
+    """
+    url = "https://api.eia.gov/v2/electricity/rto/region-data/data/"
+    params = {
+        "api_key": eia_token,
+        "frequency": "hourly",
+        "data[0]": "value",
+        "facets[respondent][]": region,
+        "facets[type][]": "D",
+        "start": f"{start_date.isoformat()}T00",
+        "end": f"{end_date.isoformat()}T23",
+        "sort[0][column]": "period",
+        "sort[0][direction]": "desc",
+        "length": 5000,
+    }
+    response = requests.get(url, params=params)
+    response.raise_for_status()
+    records = response.json().get("response", {}).get("data", [])
+    if not records:
+        return pd.DataFrame(columns=ENERGY_COLUMNS)
+    return _to_energy_frame(records).reindex(columns=ENERGY_COLUMNS)
+
+
 
 # Main function
 def main():
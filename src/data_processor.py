@@ -1,14 +1,21 @@
+import sys
 import pandas as pd
 from pathlib import Path
 from datetime import datetime 
 
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.schema import read_table
+
 RAW_DIR = Path("data/raw")
 PROCESSED_DIR = Path("data/processed")
 PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
 
-def load_and_merge_city_data(city_name):
-    weather_path = RAW_DIR / f"{city_name}_weather.csv"
-    energy_path = RAW_DIR / f"{city_name}_energy.csv"
+def load_and_merge_city_data(city_name, raw_dir=RAW_DIR):
+    weather_path = raw_dir / f"{city_name}_weather.csv"
+    energy_path = raw_dir / f"{city_name}_energy.csv"
 
     if not weather_path.exists() or not energy_path.exists():
         print(f"⚠️ Skipping {city_name}: missing raw files.")
@@ -16,8 +23,8 @@ def load_and_merge_city_data(city_name):
 
     try:
         # Load data
-        weather = pd.read_csv(weather_path, parse_dates=["datetime"])
-        energy = pd.read_csv(energy_path, parse_dates=["datetime"])
+        weather = read_table(weather_path, "weather")
+        energy = read_table(energy_path, "energy")
 
         # Merge on datetime
         df = pd.merge(weather, energy, on="datetime", how="inner")
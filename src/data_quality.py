@@ -1,20 +1,48 @@
+import sys
+import json
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime, timedelta
 
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src import store
+from src.schema import read_table, SchemaError
+
 PROCESSED_FILE = Path("data/processed/merged_data.csv")
 REPORT_FILE = Path("data/processed/data_quality_report.csv")
+ANOMALY_REPORT_FILE = Path("data/processed/anomaly_report.csv")
+ANOMALY_STATE_FILE = Path("data/processed/anomaly_state.json")
 
 # Thresholds
 TEMP_MIN = -50
 TEMP_MAX = 130
 FRESHNESS_THRESHOLD_DAYS = 3
 
+# Anomaly detection settings
+ROLLING_WINDOW = 14           # trailing observations per city for median/MAD
+MIN_PERIODS = 7
+MAD_Z_THRESHOLD = 3.5
+MAD_SCALE = 1.4826            # makes MAD comparable to a standard deviation
+FLATLINE_MIN_RUN = 3          # identical consecutive readings before flagging
+SEASONAL_PERIODS = 4          # same weekday/hour observations in the baseline
+DIURNAL_RANGE_MIN_F = 4.0     # median tmax-tmin below this suggests a unit/scale error
+TEMP_BASELINE_WINDOW = 28     # trailing observations per city for the seasonal temperature level
+TEMP_LEVEL_DEVIATION_F = 25.0 # distance from that level that, read as °C, lands back on it
+RUN_CHECKS = ["temp_unit_suspect"]  # reported as one row per run, not per reading
+RUN_GAP = pd.Timedelta(days=1)
+LOOKBACK_DAYS = 60            # history loaded as context for incremental runs
+ANOMALY_COLUMNS = ["avg_temp_f", "energy_consumption_mw"]
+REPORT_COLUMNS = ["datetime", "end_datetime", "city", "column", "check", "value", "score"]
+
 
 def load_data():
     if not PROCESSED_FILE.exists():
         raise FileNotFoundError(f"{PROCESSED_FILE} not found. Run data_processor.py first.")
-    df = pd.read_csv(PROCESSED_FILE, parse_dates=["datetime"])
+    df = read_table(PROCESSED_FILE, "merged")
     return df
 
 
@@ -55,6 +83,207 @@ def quality_metrics_over_time(df):
     return daily
 
 
+def _robust_z(values, groups):
+    """Trailing rolling median/MAD z-score, computed per group in one pass."""
+    roll = values.groupby(groups).rolling(ROLLING_WINDOW, min_periods=MIN_PERIODS)
+    median = roll.median().reset_index(level=0, drop=True)
+    abs_dev = (values - median).abs()
+    mad = (
+        abs_dev.groupby(groups)
+        .rolling(ROLLING_WINDOW, min_periods=MIN_PERIODS)
+        .median()
+        .reset_index(level=0, drop=True)
+    )
+    return (values - median) / (MAD_SCALE * mad.replace(0, np.nan))
+
+
+def _run_length(values, groups):
+    """Length of the run of identical values ending at each row, per group."""
+    new_run = (values != values.groupby(groups).shift()) | values.isna()
+    run_id = new_run.cumsum()
+    return values.groupby([groups, run_id]).cumcount() + 1
+
+
+def detect_anomalies(df, keys=None):
+    """Flag statistical anomalies for every city at once.
+
+    All windows are trailing, so a row's flags only depend on earlier rows.
+    Passing ``keys`` (a frame of city/datetime pairs) reports only those
+    rows, while the other rows in ``df`` serve as context.
+
+    Returns one row per (datetime, city, column, check) with the offending
+    value and its score.
+    """
+    df = df.sort_values(["city", "datetime"]).reset_index(drop=True)
+    city = df["city"]
+    flags = []
+
+    for col in ANOMALY_COLUMNS:
+        values = df[col].astype(float)
+
+        # Spikes and drops relative to the recent level
+        z = _robust_z(values, city)
+        flags.append(pd.DataFrame({"check": "mad_zscore", "column": col, "value": values, "score": z})[
+            z.abs() > MAD_Z_THRESHOLD
+        ])
+
+        # Stuck sensors / meters
+        run = _run_length(values, city)
+        flags.append(pd.DataFrame({"check": "flatline", "column": col, "value": values, "score": run})[
+            run >= FLATLINE_MIN_RUN
+        ])
+
+    # Demand against the same weekday/hour in previous weeks
+    energy = df["energy_consumption_mw"].astype(float)
+    slot = [city, df["datetime"].dt.dayofweek, df["datetime"].dt.hour]
+    baseline = (
+        energy.groupby(slot).shift()
+        .groupby(slot)
+        .rolling(SEASONAL_PERIODS, min_periods=2)
+        .median()
+        .reset_index(level=[0, 1, 2], drop=True)
+    )
+    z = _robust_z(energy - baseline, city)
+    flags.append(pd.DataFrame({"check": "seasonal_residual", "column": "energy_consumption_mw", "value": energy, "score": z})[
+        z.abs() > MAD_Z_THRESHOLD
+    ])
+
+    # Temperatures recorded in the wrong unit or scale. Real daily
+    # temperatures swing more than a few degrees, so a tiny range means the
+    # values were scaled; a reading far from the city's seasonal level that
+    # lands back on it when read as °C was reported in Celsius.
+    temp = df["avg_temp_f"].astype(float)
+    diurnal = (df["tmax_f"] - df["tmin_f"]).astype(float)
+    typical_range = (
+        diurnal.groupby(city)
+        .rolling(ROLLING_WINDOW, min_periods=MIN_PERIODS)
+        .median()
+        .reset_index(level=0, drop=True)
+    )
+    level = (
+        temp.groupby(city).shift()
+        .groupby(city)
+        .rolling(TEMP_BASELINE_WINDOW, min_periods=MIN_PERIODS)
+        .median()
+        .reset_index(level=0, drop=True)
+    )
+    deviation = (temp - level).abs()
+    as_celsius = (temp * 9 / 5 + 32 - level).abs()
+    suspect = (typical_range < DIURNAL_RANGE_MIN_F) | (
+        (deviation > TEMP_LEVEL_DEVIATION_F) & (as_celsius < TEMP_LEVEL_DEVIATION_F / 2)
+    )
+    flags.append(pd.DataFrame({"check": "temp_unit_suspect", "column": "avg_temp_f", "value": temp, "score": deviation})[
+        suspect
+    ])
+
+    anomalies = pd.concat(flags)
+    anomalies = df[["datetime", "city"]].join(anomalies, how="inner")
+    anomalies["end_datetime"] = anomalies["datetime"]
+    anomalies = anomalies[REPORT_COLUMNS]
+
+    if keys is not None:
+        anomalies = anomalies[_key_index(anomalies).isin(_key_index(keys))]
+
+    return collapse_runs(anomalies)
+
+
+def collapse_runs(anomalies):
+    """Merge RUN_CHECKS flags no more than RUN_GAP apart into one row per run.
+
+    Each run keeps its first value and its largest score. Rows that are
+    already runs are merged too, so a report can be extended incrementally.
+    """
+    is_run = anomalies["check"].isin(RUN_CHECKS)
+    group = ["city", "column", "check"]
+    runs = anomalies[is_run].sort_values(group + ["datetime"])
+
+    prev_end = runs.groupby(group)["end_datetime"].cummax().groupby([runs[col] for col in group]).shift()
+    run_id = (prev_end.isna() | (runs["datetime"] > prev_end + RUN_GAP)).cumsum()
+    collapsed = runs.groupby(run_id).agg(
+        datetime=("datetime", "min"),
+        end_datetime=("end_datetime", "max"),
+        city=("city", "first"),
+        column=("column", "first"),
+        check=("check", "first"),
+        value=("value", "first"),
+        score=("score", "max"),
+    )
+
+    anomalies = pd.concat([anomalies[~is_run], collapsed[REPORT_COLUMNS]], ignore_index=True)
+    return anomalies.sort_values(["city", "datetime", "column", "check"]).reset_index(drop=True)
+
+
+def _key_index(df):
+    return pd.MultiIndex.from_frame(df[["city", "datetime"]])
+
+
+def _load_checked_version():
+    """Store version the anomaly report is up to date with (None: never run)."""
+    if not ANOMALY_STATE_FILE.exists():
+        return None
+    with open(ANOMALY_STATE_FILE, "r") as f:
+        # Older state files held per-city datetimes; treat them as never run
+        return json.load(f).get("version")
+
+
+def _load_with_context(changed, columns):
+    """Rows of each changed city from LOOKBACK_DAYS before its first change to its last."""
+    spans = changed.groupby("city")["datetime"].agg(["min", "max"])
+    frames = [
+        store.query([city], start=first - timedelta(days=LOOKBACK_DAYS), end=last, columns=columns)
+        for city, (first, last) in spans.iterrows()
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def generate_anomaly_report(full=False):
+    """Run anomaly detection over changed rows (or everything) and update the report.
+
+    Work is selected by store version rather than by date, so backfilled
+    history and corrected values for older dates are checked as well.
+    Returns only the anomalies found in this run.
+    """
+    current = store.version()
+    checked = None if full else _load_checked_version()
+    columns = ["datetime", "city", "tmax_f", "tmin_f"] + ANOMALY_COLUMNS
+
+    previous = None
+    if checked is not None:
+        try:
+            previous = read_table(ANOMALY_REPORT_FILE, "anomaly_report")
+        except (FileNotFoundError, SchemaError):
+            # Missing or written in an older layout: rebuild it
+            checked = None
+
+    if checked is None:
+        df = store.query(columns=columns)
+        changed = df[["city", "datetime"]]
+    else:
+        changed = store.query(since_version=checked, columns=["city", "datetime"])
+        df = _load_with_context(changed, columns) if not changed.empty else pd.DataFrame()
+
+    if df.empty:
+        anomalies = pd.DataFrame(columns=REPORT_COLUMNS).astype(
+            {"datetime": "datetime64[ns]", "end_datetime": "datetime64[ns]", "value": float, "score": float}
+        )
+    else:
+        anomalies = detect_anomalies(df, changed if checked is not None else None)
+
+    report = anomalies
+    if previous is not None:
+        # Changed rows are re-checked from scratch, so their old flags go
+        previous = previous[~_key_index(previous).isin(_key_index(changed))]
+        report = collapse_runs(pd.concat([previous, anomalies], ignore_index=True))
+    if checked is None or not changed.empty:
+        report.to_csv(ANOMALY_REPORT_FILE, index=False)
+
+    with open(ANOMALY_STATE_FILE, "w") as f:
+        json.dump({"version": current}, f, indent=2)
+
+    print(f"🚨 {len(anomalies)} new anomalies in {len(changed)} changed rows, {len(report)} in total in {ANOMALY_REPORT_FILE}")
+    return anomalies
+
+
 def generate_report():
     print("\n📊 Running data quality checks...")
 
@@ -76,6 +305,11 @@ def generate_report():
     report["days_since_latest"] = freshness_days
     report["data_is_stale"] = is_stale
 
+    # Statistical anomalies found in rows changed since the last run
+    anomalies = generate_anomaly_report()
+    if not anomalies.empty:
+        report["new_anomalies_by_check"] = anomalies["check"].value_counts().to_dict()
+
     # Print summary
     print("\n📌 Summary:")
     for key, value in report.items():
@@ -18,13 +18,16 @@ from src.data_fetcher import fetch_noaa_weather, fetch_eia_energy
 from src.data_processor import load_and_merge_city_data, clean_data
 from src.data_quality import generate_report as run_data_quality_checks
 from src.analysis import analyze_merged_data
+from src.cross_city import generate_cross_city_report
+from src.station_resolver import resolve_cities, unresolved_cities
+from src import store
 
 # Load config
 with open("config/config.yaml", "r") as f:
     config = yaml.safe_load(f)
 
 # Extract config elements
-cities = config["cities"]
+cities = resolve_cities(config["cities"])  # fills station_id / eia_region from lat/lon when missing
 days_back = config["settings"]["days_back"]
 # API keys are now loaded in the modules that use them (e.g., data_fetcher)
 # and are no longer needed here.
@@ -52,7 +55,12 @@ logging.getLogger("").addHandler(console)
 def fetch_all_data(cities_config, days):
     """Fetches weather and energy data for all configured cities."""
     logging.info("--- STAGE 1: DATA FETCHING ---")
+    skipped = unresolved_cities(cities_config)
+    for city in skipped:
+        logging.warning(f"Skipping {city}: no station_id / eia_region within range of its lat/lon.")
     for city, info in cities_config.items():
+        if city in skipped:
+            continue
         try:
             logging.info(f"Fetching data for {city}...")
             fetch_noaa_weather(city, info["station_id"], days)
@@ -96,6 +104,8 @@ def run_downstream_scripts():
         run_data_quality_checks()
         logging.info("Running data analysis...")
         analyze_merged_data()
+        logging.info("Running cross-city comparison...")
+        generate_cross_city_report()
         logging.info("--- Downstream scripts complete ---")
     except Exception as e:
         logging.error(f"Failed to run downstream scripts: {e}", exc_info=True)
@@ -110,6 +120,8 @@ def run_pipeline():
     if final_df is not None:
         final_df.to_csv(merged_output_path, index=False)
         logging.info(f"✅ Merged data saved to {merged_output_path}")
+        store.upsert(final_df)
+        logging.info(f"✅ Merged data upserted into {store.DB_FILE}")
         run_downstream_scripts()
     else:
         logging.error("Pipeline halted due to processing failure.")
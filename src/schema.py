@@ -0,0 +1,128 @@
+import pandas as pd
+from pathlib import Path
+
+# pyarrow's multithreaded CSV reader is much faster and parses datetimes
+# itself; fall back to the pandas C engine without it
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+# Column -> dtype for every CSV the project reads. "datetime" columns are read
+# as text and parsed with the file's exact format instead of being inferred.
+SCHEMAS = {
+    "weather": {
+        "columns": {
+            "datetime": "datetime",
+            "city": "string",
+            "tmax_f": "float64",
+            "tmin_f": "float64",
+            "avg_temp_f": "float64",
+        },
+        "datetime_format": "%Y-%m-%d",
+    },
+    "energy": {
+        "columns": {
+            "datetime": "datetime",
+            "respondent": "string",
+            "respondent-name": "string",
+            "type": "string",
+            "type-name": "string",
+            "energy_consumption_mw": "Int64",
+            "value-units": "string",
+        },
+        "datetime_format": "%Y-%m-%d %H:%M:%S",
+    },
+    "merged": {
+        "columns": {
+            "datetime": "datetime",
+            "city": "string",
+            "tmax_f": "float64",
+            "tmin_f": "float64",
+            "avg_temp_f": "float64",
+            "respondent": "string",
+            "respondent-name": "string",
+            "type": "string",
+            "type-name": "string",
+            "energy_consumption_mw": "Int64",
+            "value-units": "string",
+        },
+        # pandas writes date-only values when every row is at midnight
+        "datetime_format": "ISO8601",
+    },
+    "anomaly_report": {
+        "columns": {
+            "datetime": "datetime",
+            "end_datetime": "datetime",
+            "city": "string",
+            "column": "string",
+            "check": "string",
+            "value": "float64",
+            "score": "float64",
+        },
+        "datetime_format": "ISO8601",
+    },
+}
+
+
+class SchemaError(ValueError):
+    """A CSV file does not match its registered schema."""
+
+
+def read_table(path, kind, columns=None):
+    """Read a registered CSV with explicit dtypes, datetime format and column projection.
+
+    Only ``columns`` (default: every registered column) are parsed. Raises
+    SchemaError if any of them is missing from the file or cannot be parsed
+    as its declared type.
+    """
+    path = Path(path)
+    schema = SCHEMAS[kind]
+    wanted = list(columns or schema["columns"])
+    unknown = [col for col in wanted if col not in schema["columns"]]
+    if unknown:
+        raise SchemaError(f"Columns {unknown} are not part of the '{kind}' schema.")
+
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [col for col in wanted if col not in header]
+    if missing:
+        raise SchemaError(f"{path} is missing columns {missing} expected by the '{kind}' schema.")
+
+    dtypes = {col: schema["columns"][col] for col in wanted}
+    read = _read_pyarrow if pa is not None else _read_c
+    try:
+        df = read(path, dtypes, schema["datetime_format"])
+    except (ValueError, TypeError) as e:
+        raise SchemaError(f"{path} does not match the '{kind}' schema: {e}") from e
+
+    return df[wanted]
+
+
+def _read_pyarrow(path, dtypes, datetime_format):
+    """Parse every column, datetimes included, in a single pyarrow pass."""
+    arrow_types = {
+        "datetime": pa.timestamp("ns"),
+        "string": pa.string(),
+        "float64": pa.float64(),
+        "Int64": pa.int64(),
+    }
+    parser = pa_csv.ISO8601 if datetime_format == "ISO8601" else datetime_format
+    options = pa_csv.ConvertOptions(
+        column_types={col: arrow_types[dtype] for col, dtype in dtypes.items()},
+        include_columns=list(dtypes),
+        timestamp_parsers=[parser],
+        strings_can_be_null=True,
+    )
+    table = pa_csv.read_csv(path, convert_options=options)
+    pandas_types = {pa.string(): pd.StringDtype(), pa.int64(): pd.Int64Dtype()}
+    return table.to_pandas(types_mapper=pandas_types.get)
+
+
+def _read_c(path, dtypes, datetime_format):
+    read_dtypes = {col: ("string" if dtype == "datetime" else dtype) for col, dtype in dtypes.items()}
+    df = pd.read_csv(path, usecols=list(dtypes), dtype=read_dtypes)
+    for col, dtype in dtypes.items():
+        if dtype == "datetime":
+            df[col] = pd.to_datetime(df[col], format=datetime_format)
+    return df
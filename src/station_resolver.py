@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+import yaml
+from datetime import datetime
+from pathlib import Path
+from scipy.spatial import cKDTree
+
+# Local reference files (see README for where to download them)
+STATION_INVENTORY_FILE = Path("data/reference/ghcnd-inventory.txt")
+BA_LOOKUP_FILE = Path("data/reference/balancing_authorities.csv")
+
+# A station counts as active if it reported within this many years
+ACTIVE_YEARS = 1
+REQUIRED_ELEMENTS = ("TMAX", "TMIN")
+EARTH_RADIUS_KM = 6371.0
+
+# Beyond these distances a match is more likely wrong than useful, so the
+# value is left unset instead of silently guessing
+MAX_STATION_DISTANCE_KM = 50.0
+MAX_BA_DISTANCE_KM = 250.0
+
+# Fixed-width layout of the GHCND inventory file
+INVENTORY_COLSPECS = [(0, 11), (12, 20), (21, 30), (31, 35), (36, 40), (41, 45)]
+INVENTORY_COLUMNS = ["station", "lat", "lon", "element", "first_year", "last_year"]
+
+
+def _to_unit_xyz(lat, lon):
+    """Project lat/lon degrees onto the unit sphere so euclidean KD-tree distance tracks great-circle distance."""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+
+
+def load_station_inventory(path=STATION_INVENTORY_FILE, active_years=ACTIVE_YEARS):
+    """Load GHCND stations that have recent TMAX and TMIN coverage."""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"{path} not found. Download ghcnd-inventory.txt from NOAA first.")
+
+    inv = pd.read_fwf(path, colspecs=INVENTORY_COLSPECS, names=INVENTORY_COLUMNS, header=None)
+    cutoff_year = datetime.now().year - active_years
+    inv = inv[inv["element"].isin(REQUIRED_ELEMENTS) & (inv["last_year"] >= cutoff_year)]
+
+    # Keep only stations that report every required element
+    coverage = inv.groupby("station")["element"].nunique()
+    covered = coverage[coverage == len(REQUIRED_ELEMENTS)].index
+    stations = (
+        inv[inv["station"].isin(covered)]
+        .groupby("station", as_index=False)
+        .agg(lat=("lat", "first"), lon=("lon", "first"), last_year=("last_year", "min"))
+    )
+    return stations
+
+
+def load_ba_lookup(path=BA_LOOKUP_FILE):
+    """Load the balancing-authority table: one row per (eia_region, load centre) point."""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"{path} not found.")
+    return pd.read_csv(path, usecols=["eia_region", "lat", "lon"])
+
+
+class NearestResolver:
+    """KD-tree over a table of points with lat/lon columns."""
+
+    def __init__(self, table, key):
+        if table.empty:
+            raise ValueError("Cannot build a resolver from an empty table.")
+        self.table = table.reset_index(drop=True)
+        self.key = key
+        self.tree = cKDTree(_to_unit_xyz(self.table["lat"], self.table["lon"]))
+
+    def nearest(self, lat, lon, k=1):
+        """Return the k nearest rows with a distance_km column, closest first."""
+        k = min(k, len(self.table))
+        chord, idx = self.tree.query(_to_unit_xyz([lat], [lon])[0], k=k)
+        result = self.table.iloc[np.atleast_1d(idx)].copy()
+        result["distance_km"] = _chord_to_km(np.atleast_1d(chord))
+        return result.reset_index(drop=True)
+
+    def nearest_many(self, lats, lons):
+        """Vectorized nearest lookup: one key per input point."""
+        chord, idx = self.tree.query(_to_unit_xyz(lats, lons), k=1)
+        return self.table[self.key].to_numpy()[idx], _chord_to_km(chord)
+
+
+def build_station_resolver(path=STATION_INVENTORY_FILE):
+    return NearestResolver(load_station_inventory(path), key="station")
+
+
+def build_ba_resolver(path=BA_LOOKUP_FILE):
+    return NearestResolver(load_ba_lookup(path), key="eia_region")
+
+
+def resolve_cities(cities_config, station_resolver=None, ba_resolver=None,
+                   max_station_km=MAX_STATION_DISTANCE_KM, max_ba_km=MAX_BA_DISTANCE_KM):
+    """Fill in missing station_id / eia_region for cities from their lat/lon.
+
+    Cities that already have both values are left untouched, and the reference
+    files are only loaded when at least one city needs them. A value whose
+    nearest match is further away than the limit stays None, with a warning.
+    """
+    needs_station = [c for c, info in cities_config.items() if not info.get("station_id")]
+    needs_region = [c for c, info in cities_config.items() if not info.get("eia_region")]
+
+    resolved = {city: dict(info) for city, info in cities_config.items()}
+
+    if needs_station:
+        station_resolver = station_resolver or build_station_resolver()
+        ids, dist = station_resolver.nearest_many(
+            [resolved[c]["lat"] for c in needs_station],
+            [resolved[c]["lon"] for c in needs_station],
+        )
+        for city, station, km in zip(needs_station, ids, dist):
+            if km > max_station_km:
+                resolved[city]["station_id"] = None
+                print(f"⚠️ {city}: nearest station {station} is {km:.0f} km away (limit {max_station_km:.0f} km); station_id left unset")
+                continue
+            resolved[city]["station_id"] = f"GHCND:{station}"
+            print(f"📍 {city}: nearest station {station} ({km:.1f} km)")
+
+    if needs_region:
+        ba_resolver = ba_resolver or build_ba_resolver()
+        regions, dist = ba_resolver.nearest_many(
+            [resolved[c]["lat"] for c in needs_region],
+            [resolved[c]["lon"] for c in needs_region],
+        )
+        for city, region, km in zip(needs_region, regions, dist):
+            if km > max_ba_km:
+                resolved[city]["eia_region"] = None
+                print(f"⚠️ {city}: nearest balancing authority {region} is {km:.0f} km away (limit {max_ba_km:.0f} km); eia_region left unset")
+                continue
+            resolved[city]["eia_region"] = region
+            print(f"📍 {city}: nearest balancing authority {region} ({km:.1f} km)")
+
+    return resolved
+
+
+def unresolved_cities(cities_config):
+    """Cities still missing a station_id or eia_region after resolution."""
+    return [c for c, info in cities_config.items() if not info.get("station_id") or not info.get("eia_region")]
+
+
+def main():
+    with open("config/config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    station_resolver = build_station_resolver()
+    for city, info in config["cities"].items():
+        nearest = station_resolver.nearest(info["lat"], info["lon"], k=3)
+        print(f"\n🌆 {city} (configured: {info.get('station_id')})")
+        print(nearest[["station", "distance_km", "last_year"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
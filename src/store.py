@@ -0,0 +1,208 @@
+import sys
+import sqlite3
+import pandas as pd
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.schema import read_table
+
+DB_FILE = Path("data/processed/energy.db")
+MERGED_FILE = Path("data/processed/merged_data.csv")
+TABLE = "merged_data"
+
+# Columns kept in the store, with their SQLite types
+COLUMNS = {
+    "city": "TEXT NOT NULL",
+    "datetime": "TEXT NOT NULL",
+    "tmax_f": "REAL",
+    "tmin_f": "REAL",
+    "avg_temp_f": "REAL",
+    "energy_consumption_mw": "INTEGER",
+    "respondent": "TEXT",
+}
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Rows are clustered on (city, datetime) so city/date filters are range scans.
+# batch_id records which upsert last changed a row, so readers can fetch
+# only what changed since the version they already hold.
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {TABLE} (
+    {", ".join(f"{col} {sql_type}" for col, sql_type in COLUMNS.items())},
+    batch_id INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (city, datetime)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS batches (
+    batch_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    loaded_at TEXT NOT NULL,
+    rows INTEGER NOT NULL
+);
+"""
+INDEXES = f"""
+CREATE INDEX IF NOT EXISTS idx_{TABLE}_datetime ON {TABLE} (datetime);
+CREATE INDEX IF NOT EXISTS idx_{TABLE}_batch ON {TABLE} (batch_id);
+"""
+
+
+def connect(db_file=None):
+    db_file = Path(db_file or DB_FILE)
+    db_file.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_file)
+    conn.executescript(SCHEMA)
+    # Stores created before batch tracking existed
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({TABLE})")}
+    if "batch_id" not in existing:
+        conn.execute(f"ALTER TABLE {TABLE} ADD COLUMN batch_id INTEGER NOT NULL DEFAULT 0")
+    conn.executescript(INDEXES)
+    return conn
+
+
+def _format_datetime(value):
+    return pd.Timestamp(value).strftime(DATETIME_FORMAT)
+
+
+def upsert(df, db_file=None):
+    """Insert or update rows keyed on (city, datetime); returns the number of rows changed.
+
+    Rows whose values are identical to what is stored are left alone, so
+    their batch_id (and therefore the store version) does not move.
+    """
+    rows = df.reindex(columns=list(COLUMNS)).copy()
+    rows["datetime"] = pd.to_datetime(rows["datetime"]).dt.strftime(DATETIME_FORMAT)
+    rows = rows.astype(object).where(rows.notna(), None)
+
+    value_cols = [col for col in COLUMNS if col not in ("city", "datetime")]
+    columns = ", ".join(list(COLUMNS) + ["batch_id"])
+    placeholders = ", ".join("?" for _ in COLUMNS)
+    updates = ", ".join(f"{col} = excluded.{col}" for col in value_cols + ["batch_id"])
+    changed = " OR ".join(f"{col} IS NOT excluded.{col}" for col in value_cols)
+
+    with connect(db_file) as conn:
+        batch_id = conn.execute(
+            "INSERT INTO batches (loaded_at, rows) VALUES (datetime('now'), 0)"
+        ).lastrowid
+        before = conn.total_changes
+        conn.executemany(
+            f"INSERT INTO {TABLE} ({columns}) VALUES ({placeholders}, {batch_id}) "
+            f"ON CONFLICT (city, datetime) DO UPDATE SET {updates} WHERE {changed}",
+            rows.itertuples(index=False, name=None),
+        )
+        count = conn.total_changes - before
+        if count:
+            conn.execute("UPDATE batches SET rows = ? WHERE batch_id = ?", (count, batch_id))
+        else:
+            conn.execute("DELETE FROM batches WHERE batch_id = ?", (batch_id,))
+    return count
+
+
+def ensure_store(db_file=None):
+    """Build the store from merged_data.csv the first time it is needed."""
+    db_file = Path(db_file or DB_FILE)
+    if db_file.exists():
+        return db_file
+    if not MERGED_FILE.exists():
+        raise FileNotFoundError(f"Neither {db_file} nor {MERGED_FILE} exist. Run the pipeline first.")
+    upsert(read_table(MERGED_FILE, "merged", columns=list(COLUMNS)), db_file)
+    return db_file
+
+
+def version(db_file=None):
+    """Id of the latest batch that changed any rows."""
+    with sqlite3.connect(ensure_store(db_file)) as conn:
+        return conn.execute("SELECT COALESCE(MAX(batch_id), 0) FROM batches").fetchone()[0]
+
+
+def _where(cities=None, start=None, end=None, since_version=None):
+    clauses, params = [], []
+    if since_version is not None:
+        clauses.append("batch_id > ?")
+        params.append(since_version)
+    # None means every city; an empty selection means no rows
+    if cities is not None:
+        if len(cities) == 0:
+            clauses.append("0")
+        else:
+            clauses.append(f"city IN ({', '.join('?' for _ in cities)})")
+            params.extend(cities)
+    if start is not None:
+        clauses.append("datetime >= ?")
+        params.append(_format_datetime(start))
+    if end is not None:
+        # Dates passed as the end bound include that whole day
+        end = pd.Timestamp(end)
+        if end == end.normalize():
+            end = end + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+        clauses.append("datetime <= ?")
+        params.append(_format_datetime(end))
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _read(sql, params, db_file):
+    with sqlite3.connect(ensure_store(db_file)) as conn:
+        df = pd.read_sql_query(sql, conn, params=params)
+    if "datetime" in df:
+        df["datetime"] = pd.to_datetime(df["datetime"], format=DATETIME_FORMAT)
+    if "energy_consumption_mw" in df:
+        # Stores built before the column was INTEGER hold the values as REAL
+        df["energy_consumption_mw"] = df["energy_consumption_mw"].astype("Int64")
+    return df
+
+
+def query(cities=None, start=None, end=None, columns=None, since_version=None, db_file=None,
+          limit=None, offset=0):
+    """Rows matching the filters, with the filtering done inside SQLite.
+
+    ``since_version`` restricts the result to rows changed after that version.
+    ``limit``/``offset`` page through the result in (city, datetime) order.
+    """
+    select = ", ".join(columns or COLUMNS)
+    where, params = _where(cities, start, end, since_version)
+    sql = f"SELECT {select} FROM {TABLE}{where} ORDER BY city, datetime"
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params += [limit, offset]
+    return _read(sql, params, db_file)
+
+
+def meta(db_file=None):
+    """Cities and overall date range without loading any rows."""
+    with sqlite3.connect(ensure_store(db_file)) as conn:
+        cities = [row[0] for row in conn.execute(f"SELECT DISTINCT city FROM {TABLE} ORDER BY city")]
+        start, end, rows = conn.execute(f"SELECT MIN(datetime), MAX(datetime), COUNT(*) FROM {TABLE}").fetchone()
+    return {
+        "cities": cities,
+        "start": pd.to_datetime(start, format=DATETIME_FORMAT) if start else None,
+        "end": pd.to_datetime(end, format=DATETIME_FORMAT) if end else None,
+        "rows": rows,
+    }
+
+
+def latest(db_file=None):
+    """Latest row per city joined with that city's usage one day earlier."""
+    cols = ", ".join(f"cur.{col}" for col in COLUMNS)
+    sql = f"""
+        SELECT {cols}, prev.energy_consumption_mw AS prev_energy
+        FROM {TABLE} AS cur
+        JOIN (SELECT city, MAX(datetime) AS datetime FROM {TABLE} GROUP BY city) AS last
+            ON cur.city = last.city AND cur.datetime = last.datetime
+        LEFT JOIN {TABLE} AS prev
+            ON prev.city = cur.city AND prev.datetime = datetime(cur.datetime, '-1 day')
+        ORDER BY cur.city
+    """
+    df = _read(sql, [], db_file)
+    df["energy_change_pct"] = (df["energy_consumption_mw"] - df["prev_energy"]) / df["prev_energy"] * 100
+    return df
+
+
+def main():
+    if not MERGED_FILE.exists():
+        print(f"❌ {MERGED_FILE} not found. Run the pipeline first.")
+        return
+    count = upsert(read_table(MERGED_FILE, "merged", columns=list(COLUMNS)))
+    print(f"✅ Upserted {count} changed rows into {DB_FILE}")
+
+
+if __name__ == "__main__":
+    main()
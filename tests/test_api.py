@@ -0,0 +1,108 @@
+import unittest
+import tempfile
+from pathlib import Path
+from unittest import mock
+import pandas as pd
+from src import api, store
+
+
+class TestApiQueries(unittest.TestCase):
+
+    def setUp(self):
+        """Load the committed processed file into a temp store."""
+        if not store.MERGED_FILE.exists():
+            self.skipTest("No processed data to query.")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        db_file = Path(self.tmp.name) / "energy.db"
+        self.df = pd.read_csv(store.MERGED_FILE, parse_dates=["datetime"])
+        store.upsert(self.df, db_file)
+        patcher = mock.patch.object(store, "DB_FILE", db_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        api.clear_caches()
+        self.version = api.data_version()
+
+    def test_latest_one_row_per_city(self):
+        """/latest returns exactly one row per city at that city's max date."""
+        latest = pd.DataFrame(api.query_latest(self.version))
+        self.assertEqual(sorted(latest["city"]), sorted(self.df["city"].unique()))
+        expected = self.df.groupby("city")["datetime"].max().dt.strftime("%Y-%m-%dT%H:%M:%S")
+        self.assertEqual(latest.set_index("city")["datetime"].to_dict(), expected.to_dict())
+
+    def test_slice_filters_city_and_dates(self):
+        """/data only returns rows matching the city and date filters."""
+        rows = pd.DataFrame(api.query_slice(("houston",), "2025-07-01", "2025-07-31", limit=None))
+        self.assertTrue((rows["city"] == "houston").all())
+        self.assertTrue(rows["datetime"].between("2025-07-01", "2025-07-31T23:59:59").all())
+
+    def test_regression_matches_pandas_corr(self):
+        """Per-city r matches pandas correlation."""
+        stats = api.query_regression(self.version, ("chicago",))
+        expected = self.df[self.df["city"] == "chicago"][["avg_temp_f", "energy_consumption_mw"]].corr().iloc[0, 1]
+        self.assertAlmostEqual(stats["chicago"]["r"], expected)
+
+
+class TestApiRoutes(unittest.TestCase):
+
+    def setUp(self):
+        """Serve a small temp store through the real routes."""
+        from fastapi.testclient import TestClient
+
+        self.tmp = tempfile.TemporaryDirectory()
+        db_file = Path(self.tmp.name) / "energy.db"
+        store.upsert(pd.DataFrame({
+            "datetime": pd.to_datetime(["2025-07-01", "2025-07-02", "2025-07-01", "2025-07-02"]),
+            "city": ["houston", "houston", "seattle", "seattle"],
+            "avg_temp_f": [90.0, 92.0, 60.0, 62.0],
+            "energy_consumption_mw": [70000, 72000, 1100, 1150],
+        }), db_file)
+        patcher = mock.patch.object(store, "DB_FILE", db_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        api.clear_caches()
+        self.client = TestClient(api.app)
+
+    def test_data_filters_by_city_and_date(self):
+        response = self.client.get("/data", params={"city": ["seattle"], "start": "2025-07-02"})
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()
+        self.assertEqual([(r["city"], r["datetime"]) for r in rows], [("seattle", "2025-07-02T00:00:00")])
+
+    def test_data_is_paged(self):
+        first = self.client.get("/data", params={"limit": 3}).json()
+        rest = self.client.get("/data", params={"limit": 3, "offset": 3}).json()
+        self.assertEqual(len(first), 3)
+        self.assertEqual([(r["city"], r["datetime"]) for r in rest], [("seattle", "2025-07-02T00:00:00")])
+        self.assertEqual(self.client.get("/data", params={"limit": api.MAX_PAGE_SIZE + 1}).status_code, 422)
+
+    def test_new_version_drops_cached_results(self):
+        self.client.get("/meta")
+        store.upsert(pd.DataFrame({
+            "datetime": pd.to_datetime(["2025-07-03"]), "city": ["houston"],
+            "avg_temp_f": [93.0], "energy_consumption_mw": [73000],
+        }))
+        meta = self.client.get("/meta").json()
+        self.assertEqual(meta["rows"], 5)
+        self.assertEqual(api.query_meta.cache_info().currsize, 1)
+
+    def test_bad_date_is_rejected(self):
+        self.assertEqual(self.client.get("/data", params={"start": "notadate"}).status_code, 422)
+        self.assertEqual(self.client.get("/regression", params={"end": "2025-13-40"}).status_code, 422)
+
+    def test_unknown_city_is_404(self):
+        self.assertEqual(self.client.get("/heatmap/nowhere").status_code, 404)
+        self.assertEqual(self.client.get("/data", params={"city": ["houston", "nowhere"]}).status_code, 404)
+
+    def test_heatmap_and_regression(self):
+        heatmap = self.client.get("/heatmap/houston").json()
+        self.assertEqual(heatmap["index"][-1], ">90°F")
+        regression = self.client.get("/regression", params={"city": ["houston"]}).json()
+        self.assertAlmostEqual(regression["houston"]["slope"], 1000.0)
+        latest = self.client.get("/latest").json()
+        self.assertEqual(len(latest), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import tempfile
+from datetime import date
+from pathlib import Path
+import pandas as pd
+from src import store
+from src.backfill import plan_shards, run_backfill, compact, load_manifest, load_into_store
+
+
+class TestBackfill(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.raw_dir = Path(self.tmp.name)
+        self.backfill_dir = self.raw_dir / "backfill"
+        self.manifest = self.backfill_dir / "manifest.json"
+        self.cities = {"houston": {"station_id": "GHCND:X", "eia_region": "ERCO"}}
+        self.calls = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _fake_fetch(self, fail_ids=()):
+        def fetch(shard, city_info, backfill_dir):
+            self.calls.append(shard["id"])
+            if shard["id"] in fail_ids:
+                raise RuntimeError("boom")
+            if shard["kind"] == "weather":
+                days = pd.date_range(shard["start"], shard["end"], freq="D")
+                df = pd.DataFrame({"datetime": days, "city": shard["city"], "tmax_f": 90.0, "tmin_f": 70.0, "avg_temp_f": 80.0})
+            else:
+                hours = pd.date_range(shard["start"], pd.Timestamp(shard["end"]) + pd.Timedelta(hours=23), freq="h")
+                df = pd.DataFrame({
+                    "datetime": hours, "respondent": city_info["eia_region"], "respondent-name": "ERCOT",
+                    "type": "D", "type-name": "Demand", "energy_consumption_mw": 1, "value-units": "megawatthours",
+                })
+            out = backfill_dir / f"{shard['id']}.csv"
+            out.parent.mkdir(parents=True, exist_ok=True)
+            df.to_csv(out, index=False)
+            return len(df)
+        return fetch
+
+    def test_plan_covers_range_without_overlap(self):
+        shards = plan_shards(["houston"], date(2024, 1, 1), date(2024, 3, 15), shard_days=30)
+        weather = [s for s in shards if s["kind"] == "weather"]
+        self.assertEqual(weather[0]["start"], date(2024, 1, 1))
+        self.assertEqual(weather[-1]["end"], date(2024, 3, 15))
+        total = sum((s["end"] - s["start"]).days + 1 for s in weather)
+        self.assertEqual(total, 75)
+
+    def test_resume_only_reruns_failed_shards(self):
+        shards = plan_shards(["houston"], date(2024, 1, 1), date(2024, 3, 15))
+        failing = shards[1]["id"]
+        failed = run_backfill(self.cities, date(2024, 1, 1), date(2024, 3, 15), workers=2,
+                              backfill_dir=self.backfill_dir, manifest_file=self.manifest,
+                              fetch_shard=self._fake_fetch({failing}))
+        self.assertEqual(failed, [failing])
+        self.assertEqual(load_manifest(self.manifest)[failing]["status"], "failed")
+
+        self.calls.clear()
+        failed = run_backfill(self.cities, date(2024, 1, 1), date(2024, 3, 15), workers=2,
+                              backfill_dir=self.backfill_dir, manifest_file=self.manifest,
+                              fetch_shard=self._fake_fetch())
+        self.assertEqual(failed, [])
+        self.assertEqual(self.calls, [failing])
+
+        compact(self.cities.keys(), raw_dir=self.raw_dir, backfill_dir=self.backfill_dir)
+        weather = pd.read_csv(self.raw_dir / "houston_weather.csv", parse_dates=["datetime"])
+        self.assertEqual(len(weather), 75)
+        self.assertTrue(weather["datetime"].is_monotonic_increasing)
+        energy = pd.read_csv(self.raw_dir / "houston_energy.csv", parse_dates=["datetime"])
+        self.assertEqual(len(energy), 75 * 24)
+
+    def test_backfilled_rows_reach_the_store(self):
+        run_backfill(self.cities, date(2024, 1, 1), date(2024, 3, 15), workers=2,
+                     backfill_dir=self.backfill_dir, manifest_file=self.manifest,
+                     fetch_shard=self._fake_fetch())
+        compact(self.cities.keys(), raw_dir=self.raw_dir, backfill_dir=self.backfill_dir)
+
+        db_file = self.raw_dir / "energy.db"
+        load_into_store(self.cities.keys(), raw_dir=self.raw_dir, db_file=db_file)
+
+        rows = store.query(["houston"], db_file=db_file)
+        self.assertEqual(len(rows), 75)
+        self.assertEqual(rows["datetime"].min(), pd.Timestamp("2024-01-01"))
+        self.assertEqual(rows["datetime"].max(), pd.Timestamp("2024-03-15"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.cross_city import compare_cities, columnwise_corr
+
+
+class TestCrossCity(unittest.TestCase):
+
+    def setUp(self):
+        """Two weeks of daily data: a flat city and a city with weekday load."""
+        dates = pd.date_range("2025-06-02", periods=14, freq="D")  # starts on a Monday
+        weekday = dates.dayofweek < 5
+        self.df = pd.concat([
+            pd.DataFrame({"datetime": dates, "city": "flat", "avg_temp_f": 75.0, "energy_consumption_mw": 100.0}),
+            pd.DataFrame({
+                "datetime": dates,
+                "city": "office",
+                "avg_temp_f": np.linspace(70, 90, len(dates)),
+                "energy_consumption_mw": np.where(weekday, 300.0, 200.0),
+            }),
+        ], ignore_index=True)
+
+    def test_ranking_metrics(self):
+        ranking, correlation = compare_cities(self.df)
+        ranking = ranking.set_index("city")
+        self.assertAlmostEqual(ranking.loc["flat", "peak_to_average"], 1.0)
+        self.assertAlmostEqual(ranking.loc["flat", "mw_per_degree_day"], 10.0)
+        self.assertAlmostEqual(ranking.loc["office", "weekday_weekend_delta_mw"], 100.0)
+        self.assertAlmostEqual(ranking.loc["office", "weekday_weekend_delta_pct"], 50.0)
+        self.assertEqual(ranking.loc["office", "mean_energy_mw_rank"], 1)
+        self.assertEqual(list(correlation.columns), ["flat", "office"])
+
+    def test_degree_days_ignore_days_without_temperature(self):
+        df = self.df.copy()
+        flat = df["city"] == "flat"
+        df.loc[flat & (df["datetime"] >= "2025-06-09"), "avg_temp_f"] = np.nan
+        ranking, _ = compare_cities(df)
+        self.assertAlmostEqual(ranking.set_index("city").loc["flat", "mw_per_degree_day"], 10.0)
+
+    def test_columnwise_corr_matches_pandas(self):
+        rng = np.random.default_rng(1)
+        a = pd.DataFrame(rng.normal(size=(50, 3)), columns=list("xyz"))
+        b = a * 2 + rng.normal(size=(50, 3))
+        b.iloc[5, 1] = np.nan
+        expected = [a[c].corr(b[c]) for c in a.columns]
+        np.testing.assert_allclose(columnwise_corr(a, b), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import tempfile
+from pathlib import Path
+from unittest import mock
+import pandas as pd
+from src import store
+from src.data_cache import IncrementalQueryCache, open_ended_filters
+
+
+class TestIncrementalQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_file = Path(self.tmp.name) / "energy.db"
+        self.df = pd.DataFrame({
+            "datetime": pd.to_datetime(["2025-06-01", "2025-06-02"]),
+            "city": ["houston", "houston"],
+            "avg_temp_f": [90.0, 91.0],
+            "energy_consumption_mw": [200.0, 220.0],
+        })
+        store.upsert(self.df, self.db_file)
+        self.cache = IncrementalQueryCache(db_file=self.db_file, background=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_unchanged_store_is_served_from_cache(self):
+        self.cache.get(["houston"])
+        with mock.patch.object(store, "query", wraps=store.query) as query:
+            self.cache.get(["houston"])
+        query.assert_not_called()
+
+    def test_refresh_fetches_only_changed_rows(self):
+        self.cache.get(["houston"])
+        new = pd.DataFrame({
+            "datetime": pd.to_datetime(["2025-06-02", "2025-06-03"]),
+            "city": ["houston", "houston"],
+            "avg_temp_f": [91.0, 92.0],
+            "energy_consumption_mw": [225.0, 230.0],
+        })
+        store.upsert(pd.concat([self.df.iloc[[0]], new]), self.db_file)
+
+        with mock.patch.object(store, "query", wraps=store.query) as query:
+            frame = self.cache.get(["houston"])
+        self.assertIsNotNone(query.call_args.kwargs["since_version"])
+        self.assertEqual(frame["energy_consumption_mw"].tolist(), [200.0, 225.0, 230.0])
+
+    def test_default_filters_refresh_incrementally_after_new_data(self):
+        # The dashboard's defaults: every city and the store's full date range
+        meta = store.meta(self.db_file)
+        filters = open_ended_filters(meta, meta["cities"], meta["start"].date(), meta["end"].date())
+        self.assertEqual(filters, (None, None, None))
+        self.cache.get(*filters)
+
+        new = pd.DataFrame({
+            "datetime": pd.to_datetime(["2025-06-03"]),
+            "city": ["houston"],
+            "avg_temp_f": [92.0],
+            "energy_consumption_mw": [230.0],
+        })
+        store.upsert(new, self.db_file)
+
+        # The defaults now reach the new last day but map to the same key
+        meta = store.meta(self.db_file)
+        filters = open_ended_filters(meta, meta["cities"], meta["start"].date(), meta["end"].date())
+        with mock.patch.object(store, "query", wraps=store.query) as query:
+            frame = self.cache.get(*filters)
+        query.assert_called_once()
+        self.assertIsNotNone(query.call_args.kwargs["since_version"])
+        self.assertEqual(frame["datetime"].max(), pd.Timestamp("2025-06-03"))
+
+    def test_narrower_filters_are_kept(self):
+        meta = store.meta(self.db_file)
+        filters = open_ended_filters(meta, ["houston", "seattle"], pd.Timestamp("2025-06-02").date(), pd.Timestamp("2025-06-01").date())
+        self.assertEqual(filters, (["houston", "seattle"], pd.Timestamp("2025-06-02").date(), pd.Timestamp("2025-06-01").date()))
+
+
+if __name__ == '__main__':
+    unittest.main()
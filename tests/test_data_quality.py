@@ -0,0 +1,140 @@
+import unittest
+import tempfile
+from pathlib import Path
+from unittest import mock
+import numpy as np
+import pandas as pd
+from src import data_quality, store
+from src.data_quality import detect_anomalies, collapse_runs
+
+
+class TestAnomalyDetection(unittest.TestCase):
+
+    def setUp(self):
+        """Two cities of synthetic daily data with a few planted problems."""
+        rng = np.random.default_rng(0)
+        dates = pd.date_range("2025-06-01", periods=60, freq="D")
+        frames = []
+        for city, level in [("houston", 75000.0), ("seattle", 1100.0)]:
+            frames.append(pd.DataFrame({
+                "datetime": dates,
+                "city": city,
+                "tmax_f": 95 + rng.normal(0, 2, len(dates)),
+                "tmin_f": 78 + rng.normal(0, 2, len(dates)),
+                "energy_consumption_mw": level * (1 + rng.normal(0, 0.02, len(dates))),
+            }))
+        df = pd.concat(frames, ignore_index=True)
+        df["avg_temp_f"] = (df["tmax_f"] + df["tmin_f"]) / 2
+
+        houston = df["city"] == "houston"
+        seattle = df["city"] == "seattle"
+        # Demand spike in Houston
+        df.loc[houston & (df["datetime"] == "2025-07-10"), "energy_consumption_mw"] = 150000.0
+        # Stuck meter in Seattle for five days
+        stuck = seattle & df["datetime"].between("2025-07-01", "2025-07-05")
+        df.loc[stuck, "energy_consumption_mw"] = 1234.0
+        # Seattle temperatures scaled down from late July on
+        scaled = seattle & (df["datetime"] >= "2025-07-20")
+        df.loc[scaled, ["tmax_f", "tmin_f", "avg_temp_f"]] = df.loc[scaled, ["tmax_f", "tmin_f", "avg_temp_f"]] / 10 + 30
+        self.df = df
+
+    def test_flags_planted_anomalies(self):
+        anomalies = detect_anomalies(self.df)
+        checks = set(zip(anomalies["city"], anomalies["check"], anomalies["datetime"].dt.strftime("%Y-%m-%d")))
+        self.assertIn(("houston", "mad_zscore", "2025-07-10"), checks)
+        self.assertIn(("seattle", "flatline", "2025-07-05"), checks)
+        self.assertNotIn("houston", set(anomalies[anomalies["check"] == "temp_unit_suspect"]["city"]))
+
+        # The scaled readings are reported as a single run
+        units = anomalies[anomalies["check"] == "temp_unit_suspect"]
+        self.assertEqual(len(units), 1)
+        self.assertLessEqual(units["datetime"].iloc[0], pd.Timestamp("2025-07-30"))
+        self.assertEqual(units["end_datetime"].iloc[0], pd.Timestamp("2025-07-30"))
+
+    def test_flags_celsius_readings_with_a_normal_range(self):
+        houston = (self.df["city"] == "houston") & (self.df["datetime"] >= "2025-07-20")
+        cols = ["tmax_f", "tmin_f", "avg_temp_f"]
+        self.df.loc[houston, cols] = (self.df.loc[houston, cols] - 32) * 5 / 9
+
+        anomalies = detect_anomalies(self.df)
+        units = anomalies[(anomalies["city"] == "houston") & (anomalies["check"] == "temp_unit_suspect")]
+        self.assertEqual(len(units), 1)
+        self.assertEqual(units["datetime"].iloc[0], pd.Timestamp("2025-07-20"))
+
+    def test_incremental_matches_full_run(self):
+        """Running only over new rows gives the same flags as a full run."""
+        full = detect_anomalies(self.df)
+        watermark = pd.Timestamp("2025-07-15")
+        keys = self.df[self.df["datetime"] > watermark][["city", "datetime"]]
+        incremental = detect_anomalies(self.df, keys)
+        expected = full[full["datetime"] > watermark].reset_index(drop=True)
+        pd.testing.assert_frame_equal(incremental, expected)
+
+    def test_incremental_flags_extend_an_existing_run(self):
+        full = detect_anomalies(self.df)
+        watermark = pd.Timestamp("2025-07-28")
+        before = self.df[self.df["datetime"] <= watermark][["city", "datetime"]]
+        after = self.df[self.df["datetime"] > watermark][["city", "datetime"]]
+        merged = collapse_runs(pd.concat([detect_anomalies(self.df, before), detect_anomalies(self.df, after)], ignore_index=True))
+        pd.testing.assert_frame_equal(merged, full)
+
+
+class TestAnomalyReport(unittest.TestCase):
+
+    def setUp(self):
+        """Point the store, report and watermark files at a temp directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        tmp = Path(self.tmp.name)
+        for target, attr, value in [
+            (store, "DB_FILE", tmp / "energy.db"),
+            (data_quality, "ANOMALY_REPORT_FILE", tmp / "anomaly_report.csv"),
+            (data_quality, "ANOMALY_STATE_FILE", tmp / "anomaly_state.json"),
+        ]:
+            patcher = mock.patch.object(target, attr, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _city(self, city, start, periods, spike_at=None):
+        dates = pd.date_range(start, periods=periods, freq="D")
+        energy = 1000.0 + np.arange(periods) % 3
+        df = pd.DataFrame({
+            "datetime": dates, "city": city, "tmax_f": 95.0 + np.arange(periods) % 2,
+            "tmin_f": 75.0, "energy_consumption_mw": energy,
+        })
+        df["avg_temp_f"] = (df["tmax_f"] + df["tmin_f"]) / 2
+        if spike_at is not None:
+            df.loc[df["datetime"] == spike_at, "energy_consumption_mw"] = 5000.0
+        return df
+
+    def test_city_added_later_gets_full_history_checked(self):
+        store.upsert(self._city("houston", "2024-01-01", 400))
+        data_quality.generate_anomaly_report()
+
+        # New city whose spike predates houston's watermark by far more than the lookback
+        store.upsert(self._city("seattle", "2024-01-01", 400, spike_at="2024-02-15"))
+        new = data_quality.generate_anomaly_report()
+
+        spikes = new[(new["city"] == "seattle") & (new["check"] == "mad_zscore")]
+        self.assertIn(pd.Timestamp("2024-02-15"), set(spikes["datetime"]))
+        self.assertTrue(new[new["city"] == "houston"].empty)
+
+    def test_older_rows_upserted_later_are_checked(self):
+        store.upsert(self._city("houston", "2025-01-01", 120))
+        self.assertTrue(data_quality.generate_anomaly_report().empty)
+
+        # Backfilled history, all of it older than anything checked so far
+        store.upsert(self._city("houston", "2024-01-01", 200, spike_at="2024-03-01"))
+        new = data_quality.generate_anomaly_report()
+
+        spikes = new[new["check"] == "mad_zscore"]
+        self.assertEqual(list(spikes["datetime"]), [pd.Timestamp("2024-03-01")])
+        report = pd.read_csv(data_quality.ANOMALY_REPORT_FILE, parse_dates=["datetime"])
+        self.assertIn(pd.Timestamp("2024-03-01"), set(report["datetime"]))
+
+        # Nothing changed since: nothing to check
+        self.assertTrue(data_quality.generate_anomaly_report().empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
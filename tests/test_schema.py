@@ -0,0 +1,58 @@
+import unittest
+import tempfile
+from pathlib import Path
+from unittest import mock
+import pandas as pd
+from src import schema
+from src.schema import read_table, SchemaError
+
+
+class TestSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "houston_weather.csv"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_committed_raw_files_match_schema(self):
+        """Raw weather and energy files load with exact datetime formats and dtypes."""
+        weather = read_table("data/raw/houston_weather.csv", "weather")
+        energy = read_table("data/raw/houston_energy.csv", "energy", columns=["datetime", "energy_consumption_mw"])
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(weather["datetime"]))
+        self.assertEqual(list(energy.columns), ["datetime", "energy_consumption_mw"])
+        self.assertGreater(energy["datetime"].dt.hour.nunique(), 1)
+
+    def test_all_midnight_energy_file_keeps_its_format(self):
+        path = Path(self.tmp.name) / "houston_energy.csv"
+        path.write_text(
+            "datetime,respondent,respondent-name,type,type-name,energy_consumption_mw,value-units\n"
+            "2025-06-01 00:00:00,ERCO,ERCOT,D,Demand,70000,megawatthours\n"
+            "2025-06-02 00:00:00,ERCO,ERCOT,D,Demand,,megawatthours\n"
+        )
+        energy = read_table(path, "energy")
+        self.assertEqual(list(energy["datetime"]), [pd.Timestamp("2025-06-01"), pd.Timestamp("2025-06-02")])
+        self.assertTrue(pd.isna(energy["energy_consumption_mw"].iloc[1]))
+
+    def test_fallback_engine_reads_the_same_frame(self):
+        if schema.pa is None:
+            self.skipTest("pyarrow not installed")
+        expected = read_table("data/processed/merged_data.csv", "merged")
+        with mock.patch.object(schema, "pa", None):
+            fallback = read_table("data/processed/merged_data.csv", "merged")
+        pd.testing.assert_frame_equal(fallback, expected, check_dtype=False)
+
+    def test_missing_column_fails_fast(self):
+        self.path.write_text("datetime,city,tmax_f,tmin_f\n2025-06-01,houston,95,78\n")
+        with self.assertRaises(SchemaError):
+            read_table(self.path, "weather")
+
+    def test_wrong_datetime_format_fails_fast(self):
+        self.path.write_text("datetime,city,tmax_f,tmin_f,avg_temp_f\n06/01/2025,houston,95,78,86.5\n")
+        with self.assertRaises(SchemaError):
+            read_table(self.path, "weather")
+
+
+if __name__ == '__main__':
+    unittest.main()
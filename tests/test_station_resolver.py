@@ -0,0 +1,76 @@
+import unittest
+import tempfile
+from datetime import datetime
+from pathlib import Path
+import pandas as pd
+from src.station_resolver import NearestResolver, build_station_resolver, build_ba_resolver, resolve_cities
+
+
+class TestStationResolver(unittest.TestCase):
+
+    def setUp(self):
+        """Write a tiny fixed-width GHCND inventory to a temp file."""
+        year = datetime.now().year
+        rows = [
+            ("USW00094728", 40.7789, -73.9692, "TMAX", 1869, year),
+            ("USW00094728", 40.7789, -73.9692, "TMIN", 1869, year),
+            ("USW00094846", 41.9950, -87.9336, "TMAX", 1958, year),
+            ("USW00094846", 41.9950, -87.9336, "TMIN", 1958, year),
+            # Closer to New York but only reports TMAX
+            ("USC00000001", 40.7130, -74.0050, "TMAX", 1990, year),
+            # Closer to Chicago but inactive
+            ("USC00000002", 41.8780, -87.6300, "TMAX", 1950, 1990),
+            ("USC00000002", 41.8780, -87.6300, "TMIN", 1950, 1990),
+        ]
+        lines = [f"{s:<11} {lat:8.4f} {lon:9.4f} {el:<4} {fy:4d} {ly:4d}" for s, lat, lon, el, fy, ly in rows]
+        self.tmp = tempfile.TemporaryDirectory()
+        self.inventory = Path(self.tmp.name) / "ghcnd-inventory.txt"
+        self.inventory.write_text("\n".join(lines) + "\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_nearest_station_requires_active_tmax_tmin(self):
+        """Only active stations with both TMAX and TMIN should be returned."""
+        resolver = build_station_resolver(self.inventory)
+        self.assertEqual(set(resolver.table["station"]), {"USW00094728", "USW00094846"})
+        nearest = resolver.nearest(41.8781, -87.6298)
+        self.assertEqual(nearest.loc[0, "station"], "USW00094846")
+        self.assertLess(nearest.loc[0, "distance_km"], 40)
+
+    def test_resolve_cities_fills_missing_ids(self):
+        """Cities missing station_id / eia_region get them from the nearest point."""
+        ba = NearestResolver(
+            pd.DataFrame({"eia_region": ["NYIS", "PJM"], "lat": [40.71, 41.88], "lon": [-74.0, -87.63]}),
+            key="eia_region",
+        )
+        cities = {
+            "new_york": {"lat": 40.7128, "lon": -74.0060},
+            "chicago": {"station_id": "GHCND:KEEP", "eia_region": "PJM", "lat": 41.8781, "lon": -87.6298},
+        }
+        resolved = resolve_cities(cities, build_station_resolver(self.inventory), ba)
+        self.assertEqual(resolved["new_york"]["station_id"], "GHCND:USW00094728")
+        self.assertEqual(resolved["new_york"]["eia_region"], "NYIS")
+        self.assertEqual(resolved["chicago"]["station_id"], "GHCND:KEEP")
+
+    def test_far_away_city_is_left_unresolved(self):
+        """Matches beyond the distance limits are not used."""
+        cities = {"honolulu": {"lat": 21.3069, "lon": -157.8583}}
+        resolved = resolve_cities(cities, build_station_resolver(self.inventory), build_ba_resolver())
+        self.assertIsNone(resolved["honolulu"]["station_id"])
+        self.assertIsNone(resolved["honolulu"]["eia_region"])
+
+    def test_shipped_ba_table_resolves_major_cities(self):
+        """The reference table maps cities outside the default config to their own BA."""
+        cities = {
+            "los_angeles": {"station_id": "GHCND:X", "lat": 34.0522, "lon": -118.2437},
+            "miami": {"station_id": "GHCND:X", "lat": 25.7617, "lon": -80.1918},
+            "minneapolis": {"station_id": "GHCND:X", "lat": 44.9778, "lon": -93.2650},
+        }
+        resolved = resolve_cities(cities, ba_resolver=build_ba_resolver())
+        self.assertEqual({c: info["eia_region"] for c, info in resolved.items()},
+                         {"los_angeles": "LDWP", "miami": "FPL", "minneapolis": "MISO"})
+
+
+if __name__ == '__main__':
+    unittest.main()
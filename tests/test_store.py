@@ -0,0 +1,55 @@
+import unittest
+import tempfile
+from pathlib import Path
+import pandas as pd
+from src import store
+
+
+class TestStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_file = Path(self.tmp.name) / "energy.db"
+        self.df = pd.DataFrame({
+            "datetime": pd.to_datetime(["2025-06-01", "2025-06-02", "2025-06-01", "2025-06-02"]),
+            "city": ["chicago", "chicago", "houston", "houston"],
+            "avg_temp_f": [70.0, 72.0, 90.0, 91.0],
+            "energy_consumption_mw": [100.0, 110.0, 200.0, 220.0],
+        })
+        store.upsert(self.df, self.db_file)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_upsert_replaces_existing_keys(self):
+        """Re-upserting the same (city, datetime) updates instead of duplicating."""
+        changed = self.df.iloc[[0]].assign(energy_consumption_mw=999.0)
+        store.upsert(changed, self.db_file)
+        result = store.query(["chicago"], db_file=self.db_file)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result.loc[0, "energy_consumption_mw"], 999.0)
+
+    def test_query_filters_city_and_inclusive_end_date(self):
+        """City and date filters are applied in SQL; the end date includes the whole day."""
+        result = store.query(["houston"], "2025-06-02", "2025-06-02", db_file=self.db_file)
+        self.assertEqual(result["city"].tolist(), ["houston"])
+        self.assertEqual(result["datetime"].tolist(), [pd.Timestamp("2025-06-02")])
+
+    def test_empty_city_selection_returns_no_rows(self):
+        """An empty selection is not the same as no filter."""
+        self.assertTrue(store.query([], db_file=self.db_file).empty)
+        self.assertEqual(len(store.query(None, db_file=self.db_file)), 4)
+
+    def test_energy_is_integer(self):
+        result = store.query(db_file=self.db_file)
+        self.assertEqual(str(result["energy_consumption_mw"].dtype), "Int64")
+
+    def test_latest_has_day_over_day_change(self):
+        """latest() returns one row per city with % change from the previous day."""
+        latest = store.latest(self.db_file).set_index("city")
+        self.assertAlmostEqual(latest.loc["chicago", "energy_change_pct"], 10.0)
+        self.assertAlmostEqual(latest.loc["houston", "energy_change_pct"], 10.0)
+
+
+if __name__ == '__main__':
+    unittest.main()